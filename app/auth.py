@@ -1,29 +1,74 @@
-from fastapi import HTTPException, status
+from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import OAuth2PasswordBearer
 from .config import settings
 import jwt
-from datetime import datetime, timedelta, timezone
-from typing import Optional
+from datetime import timedelta
+from threading import Lock
+from typing import Dict, Optional, Tuple
+import hmac
+import time
 
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+DEFAULT_EXPIRE_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+DECODE_ALGORITHMS = [ALGORITHM]
+DECODE_OPTIONS = {"require": ["exp", "sub"]}
+
+TOKEN_CACHE_SIZE = 4096
+TOKEN_CACHE_TTL = 60
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+
+# token -> (expires_at, payload). Reads are a plain dict.get, which is atomic
+# under the GIL, so the event loop never waits on the lock; the lock only
+# serializes writers (threadpool workers) against each other
+_token_cache: Dict[str, Tuple[float, dict]] = {}
+_token_cache_lock = Lock()
 
 
 def create_jwt_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
-    to_encode = data.copy()
     if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
+        expire_seconds = int(expires_delta.total_seconds())
     else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+        expire_seconds = DEFAULT_EXPIRE_SECONDS
+    to_encode = {**data, "exp": int(time.time()) + expire_seconds}
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def _cached_payload(token: str) -> Optional[dict]:
+    entry = _token_cache.get(token)
+    if entry is None or entry[0] <= time.time():
+        return None
+    return entry[1]
+
+
+def _cache_payload(token: str, payload: dict) -> None:
+    now = time.time()
+    # Cached payloads never outlive the token's own exp claim
+    expires_at = min(now + TOKEN_CACHE_TTL, payload["exp"])
+    if expires_at <= now:
+        return
+    with _token_cache_lock:
+        if len(_token_cache) >= TOKEN_CACHE_SIZE:
+            for expired in [t for t, (exp, _) in _token_cache.items() if exp <= now]:
+                del _token_cache[expired]
+        if len(_token_cache) >= TOKEN_CACHE_SIZE:
+            del _token_cache[next(iter(_token_cache))]
+        _token_cache[token] = (expires_at, payload)
+
+
 def verify_jwt_token(token: str):
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    payload = _cached_payload(token)
+    if payload is not None:
         return payload
+
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=DECODE_ALGORITHMS, options=DECODE_OPTIONS)
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -35,10 +80,25 @@ def verify_jwt_token(token: str):
             detail="Invalid token"
         )
 
+    _cache_payload(token, payload)
+    return payload
+
+
+async def current_user(token: str = Depends(oauth2_scheme)) -> dict:
+    # Cache hits are answered on the event loop; only a real jwt.decode,
+    # which is CPU-bound, is worth the hop to the threadpool
+    payload = _cached_payload(token)
+    if payload is not None:
+        return payload
+    return await run_in_threadpool(verify_jwt_token, token)
+
 
 def verify_password(plain_password: str, username: str) -> bool:
-    demo_users = settings.get_demo_users_dict()
-    return username in demo_users and demo_users.get(username) == plain_password
+    stored_password = settings.demo_users.get(username)
+    # compare_digest only accepts ASCII str, so compare the encoded bytes
+    return stored_password is not None and hmac.compare_digest(
+        stored_password.encode(), plain_password.encode()
+    )
 
 
 def authenticate_user(username: str, password: str):
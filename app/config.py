@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from functools import cached_property
 from typing import Dict
 import json
 
@@ -8,8 +9,9 @@ class Settings(BaseSettings):
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
-    def get_demo_users_dict(self) -> Dict[str, str]:
-        """Parse DEMO_USERS JSON string into dictionary"""
+    @cached_property
+    def demo_users(self) -> Dict[str, str]:
+        """Parse DEMO_USERS JSON string into dictionary (once)"""
         return json.loads(self.DEMO_USERS)
 
 settings = Settings()  # type: ignore
@@ -0,0 +1,136 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from threading import Lock
+from typing import List, Optional
+import sqlite3
+
+SCHEMA = """
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    email TEXT NOT NULL UNIQUE,
+    is_active INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    description TEXT,
+    completed INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX idx_tasks_completed ON tasks (completed, id);
+"""
+
+USER_COLUMNS = "id, username, email, is_active, created_at"
+TASK_COLUMNS = "id, title, description, completed, created_at"
+
+INSERT_USER = "INSERT INTO users (username, email, is_active, created_at) VALUES (?, ?, ?, ?)"
+SELECT_USERS = f"SELECT {USER_COLUMNS} FROM users ORDER BY id LIMIT ? OFFSET ?"
+SELECT_USER = f"SELECT {USER_COLUMNS} FROM users WHERE id = ?"
+DELETE_USER = "DELETE FROM users WHERE id = ?"
+
+INSERT_TASK = "INSERT INTO tasks (title, description, completed, created_at) VALUES (?, ?, ?, ?)"
+SELECT_TASKS = f"SELECT {TASK_COLUMNS} FROM tasks ORDER BY id LIMIT ? OFFSET ?"
+SELECT_TASKS_BY_STATUS = f"SELECT {TASK_COLUMNS} FROM tasks WHERE completed = ? ORDER BY id LIMIT ? OFFSET ?"
+UPDATE_TASK = f"UPDATE tasks SET title = ?, description = ? WHERE id = ? RETURNING {TASK_COLUMNS}"
+COMPLETE_TASK = f"UPDATE tasks SET completed = 1 WHERE id = ? RETURNING {TASK_COLUMNS}"
+DELETE_TASK = "DELETE FROM tasks WHERE id = ?"
+
+
+@dataclass(slots=True)
+class UserRow:
+    id: int
+    username: str
+    email: str
+    is_active: bool = True
+    created_at: datetime = field(default_factory=datetime.now)
+
+
+@dataclass(slots=True)
+class TaskRow:
+    id: int
+    title: str
+    description: Optional[str] = None
+    completed: bool = False
+    created_at: datetime = field(default_factory=datetime.now)
+
+
+def _user_row(cursor: sqlite3.Cursor, row: tuple) -> UserRow:
+    user_id, username, email, is_active, created_at = row
+    return UserRow(user_id, username, email, bool(is_active), datetime.fromisoformat(created_at))
+
+
+def _task_row(cursor: sqlite3.Cursor, row: tuple) -> TaskRow:
+    task_id, title, description, completed, created_at = row
+    return TaskRow(task_id, title, description, bool(completed), datetime.fromisoformat(created_at))
+
+
+# A single connection shared by the threadpool; statements are cached by
+# the sqlite3 module, the lock serializes access to the connection
+conn = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+conn.executescript(SCHEMA)
+_lock = Lock()
+
+
+def _fetch(sql: str, params: tuple, row_factory) -> list:
+    with _lock:
+        cursor = conn.cursor()
+        cursor.row_factory = row_factory
+        return cursor.execute(sql, params).fetchall()
+
+
+def _execute(sql: str, params: tuple) -> sqlite3.Cursor:
+    with _lock:
+        return conn.execute(sql, params)
+
+
+def create_user(username: str, email: str) -> Optional[UserRow]:
+    """Insert a user, returning None if the email is already taken"""
+    user = UserRow(id=0, username=username, email=email)
+    try:
+        cursor = _execute(INSERT_USER, (username, email, user.is_active, user.created_at.isoformat()))
+    except sqlite3.IntegrityError:
+        return None
+    user.id = cursor.lastrowid
+    return user
+
+
+def list_users(skip: int, limit: int) -> List[UserRow]:
+    return _fetch(SELECT_USERS, (limit, skip), _user_row)
+
+
+def get_user(user_id: int) -> Optional[UserRow]:
+    rows = _fetch(SELECT_USER, (user_id,), _user_row)
+    return rows[0] if rows else None
+
+
+def delete_user(user_id: int) -> bool:
+    return _execute(DELETE_USER, (user_id,)).rowcount > 0
+
+
+def create_task(title: str, description: Optional[str]) -> TaskRow:
+    task = TaskRow(id=0, title=title, description=description)
+    cursor = _execute(INSERT_TASK, (title, description, task.completed, task.created_at.isoformat()))
+    task.id = cursor.lastrowid
+    return task
+
+
+def list_tasks(completed: Optional[bool], skip: int, limit: int) -> List[TaskRow]:
+    if completed is None:
+        return _fetch(SELECT_TASKS, (limit, skip), _task_row)
+    return _fetch(SELECT_TASKS_BY_STATUS, (completed, limit, skip), _task_row)
+
+
+def update_task(task_id: int, title: str, description: Optional[str]) -> Optional[TaskRow]:
+    rows = _fetch(UPDATE_TASK, (title, description, task_id), _task_row)
+    return rows[0] if rows else None
+
+
+def complete_task(task_id: int) -> Optional[TaskRow]:
+    rows = _fetch(COMPLETE_TASK, (task_id,), _task_row)
+    return rows[0] if rows else None
+
+
+def delete_task(task_id: int) -> bool:
+    return _execute(DELETE_TASK, (task_id,)).rowcount > 0